@@ -1,201 +1,431 @@
 """
 code_parser.py - Extract functions and variables from source code
 """
+import bisect
+import functools
+import itertools
+import os
 import re
-from typing import Dict, List
+import string
+import warnings
+from typing import Dict, List, Optional, Pattern, Tuple
+
+try:
+    import re2 as _re  # Optional: linear-time matching (pip install google-re2)
+except ImportError:
+    _re = None
+
+try:
+    import hyperscan as _hs  # Optional: SIMD match locator (pip install hyperscan)
+except ImportError:
+    _hs = None
+
+try:
+    import tree_sitter_languages as _ts  # Optional: syntax-aware extraction (pip install tree-sitter-languages)
+except ImportError:
+    _ts = None
+
+
+# Control flow keywords to exclude
+_CONTROL_FLOW = frozenset({
+    'if', 'else', 'elif', 'for', 'while', 'switch', 'case', 
+    'do', 'break', 'continue', 'return', 'goto', 'try', 
+    'catch', 'finally', 'throw', 'raises', 'except', 'with',
+    'yield', 'assert', 'pass', 'await', 'async', 'defer',
+    'select', 'range', 'foreach', 'until', 'unless'
+})
+
+# Built-in types to exclude from variables
+_BUILTIN_TYPES = frozenset({
+    'int', 'float', 'double', 'char', 'bool', 'void', 'string',
+    'str', 'list', 'dict', 'tuple', 'set', 'array', 'vector',
+    'map', 'HashMap', 'ArrayList', 'LinkedList', 'String',
+    'Integer', 'Boolean', 'Object', 'Class', 'Interface',
+    'var', 'let', 'const', 'auto', 'long', 'short', 'unsigned',
+    'signed', 'static', 'final', 'public', 'private', 'protected'
+})
+
+# Common non-identifiers
+_NON_IDENTIFIERS = frozenset({
+    'main', 'this', 'self', 'super', 'null', 'true', 'false', 'None', 'True', 'False'
+})
+
+# File extension to language
+_EXT_MAP = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp', '.hpp': 'cpp', '.h': 'cpp',
+    '.c': 'c',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.swift': 'swift',
+    '.kt': 'kotlin', '.kts': 'kotlin',
+    '.cs': 'csharp',
+    '.scala': 'scala',
+}
+
+# Valid first characters of an identifier
+_IDENT_START = frozenset(string.ascii_letters + '_')
+
+# Skip regex scans on anything larger than this (matches RepoAnalyzer size cap)
+_MAX_CODE_SIZE = 500000  # 500KB
+
+# Per-kind result caps (variables are noisy)
+_KIND_LIMITS = {'variables': 50}
+
+
+_WHITESPACE = rb'[ \t\n\r\f\v]'
+
+
+def _compile(pattern: bytes, flags: int = re.MULTILINE | re.ASCII) -> Pattern[bytes]:
+    """Compile a language pattern with RE2 when available, else stdlib re"""
+    if _re is not None:
+        try:
+            # RE2 takes flags inline rather than as an argument. Its \w is ASCII already,
+            # but its \s lacks \v, so spell out Python's set (no pattern uses \s inside [...])
+            re2_pattern = re.sub(rb'\\[\\s]', lambda m: _WHITESPACE if m.group() == rb'\s' else m.group(), pattern)
+            return _re.compile((b'(?m)' if flags & re.MULTILINE else b'') + re2_pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+
+# Language-specific patterns (compiled once at import)
+_PATTERNS: Dict[str, Dict[str, Pattern[bytes]]] = {
+    'python': {
+        'functions': _compile(rb'^\s*def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('),
+        'classes': _compile(rb'^\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*='),
+    },
+    'javascript': {
+        'functions': _compile(
+            rb'(?:function\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*\(|'
+            rb'(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=\s*(?:async\s+)?(?:function|\(.*?\)\s*=>)|'
+            rb'([a-zA-Z_$][a-zA-Z0-9_$]*)\s*:\s*(?:async\s+)?function\s*\(|'
+            rb'([a-zA-Z_$][a-zA-Z0-9_$]*)\s*\([^)]{0,1000}\)\s*\{)'
+        ),
+        'classes': _compile(rb'class\s+([a-zA-Z_$][a-zA-Z0-9_$]*)'),
+        'variables': _compile(rb'(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*='),
+    },
+    'java': {
+        'functions': _compile(
+            rb'(?:^|\s)(?:(?:public|private|protected|static)\s+){0,4}[\w<>\[\]]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]{0,1000}\)\s*'
+            rb'(?:throws\s+[\w.]+(?:\s*,\s*[\w.]+)*\s*)?\{'
+        ),
+        'classes': _compile(rb'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'(?:^|\s)(?:(?:private|public|protected|static|final)\s+){0,4}[\w<>\[\]]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;]'),
+    },
+    'cpp': {
+        'functions': _compile(
+            rb'\b(?:[\w:]+\s+)?\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]{0,1000}\)\s*(?:const\s*)?\{'
+        ),
+        'classes': _compile(rb'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'(?:int|float|double|char|bool|auto|const|static)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;]'),
+    },
+    'c': {
+        'functions': _compile(
+            rb'\b(?:[\w\*]+\s+){1,4}([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]{0,1000}\)\s*\{'
+        ),
+        'variables': _compile(rb'(?:int|float|double|char|void|long|short|unsigned|signed|static)\s+\*?\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;\[]'),
+    },
+    'go': {
+        'functions': _compile(rb'func\s+(?:\([^)]{0,1000}\)\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\('),
+        'variables': _compile(rb'(?:var|const)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s+'),
+    },
+    'rust': {
+        'functions': _compile(rb'fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\('),
+        'variables': _compile(rb'let\s+(?:mut\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]'),
+    },
+    'php': {
+        'functions': _compile(rb'function\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('),
+        'classes': _compile(rb'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'\$([a-zA-Z_][a-zA-Z0-9_]*)\s*='),
+    },
+    'ruby': {
+        'functions': _compile(rb'def\s+([a-zA-Z_][a-zA-Z0-9_?!]*)'),
+        'classes': _compile(rb'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'@?([a-zA-Z_][a-zA-Z0-9_]*)\s*='),
+    },
+    'swift': {
+        'functions': _compile(rb'func\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\('),
+        'classes': _compile(rb'(?:class|struct|enum)\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'(?:let|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]'),
+    },
+    'kotlin': {
+        'functions': _compile(rb'fun\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\('),
+        'classes': _compile(rb'(?:class|object|interface)\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+        'variables': _compile(rb'(?:val|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]'),
+    },
+}
+
+
+# Tree-sitter grammar and query per language; capture names are the result kinds.
+# Used instead of the regexes with the opt-in tree-sitter backend (swift has no grammar
+# in tree-sitter-languages and stays on the regexes).
+_C_VARIABLES = """
+    (init_declarator declarator: (identifier) @variables)
+    (init_declarator declarator: (pointer_declarator declarator: (identifier) @variables))
+    (declaration declarator: (identifier) @variables)
+    (declaration declarator: (pointer_declarator declarator: (identifier) @variables))
+    (declaration declarator: (array_declarator declarator: (identifier) @variables))
+"""
+
+_TS_QUERIES: Dict[str, Tuple[str, str]] = {
+    'python': ('python', """
+        (function_definition name: (identifier) @functions)
+        (class_definition name: (identifier) @classes)
+        (assignment left: (identifier) @variables)
+    """),
+    # The TSX grammar also parses plain JS, JSX and TS
+    'javascript': ('tsx', """
+        (function_declaration name: (identifier) @functions)
+        (variable_declarator name: (identifier) @functions value: [(arrow_function) (function)])
+        (method_definition name: (property_identifier) @functions)
+        (pair key: (property_identifier) @functions value: [(arrow_function) (function)])
+        (class_declaration name: (_) @classes)
+        (variable_declarator name: (identifier) @variables)
+    """),
+    'java': ('java', """
+        (method_declaration name: (identifier) @functions)
+        (class_declaration name: (identifier) @classes)
+        (variable_declarator name: (identifier) @variables)
+    """),
+    'cpp': ('cpp', """
+        (function_definition declarator: (function_declarator declarator: [(identifier) (field_identifier)] @functions))
+        (function_definition declarator: (function_declarator declarator: (qualified_identifier name: (identifier) @functions)))
+        (function_definition declarator: (pointer_declarator declarator: (function_declarator declarator: (identifier) @functions)))
+        (class_specifier name: (type_identifier) @classes)
+        (field_declaration declarator: (field_identifier) @variables)
+    """ + _C_VARIABLES),
+    'c': ('c', """
+        (function_definition declarator: (function_declarator declarator: (identifier) @functions))
+        (function_definition declarator: (pointer_declarator declarator: (function_declarator declarator: (identifier) @functions)))
+    """ + _C_VARIABLES),
+    'go': ('go', """
+        (function_declaration name: (identifier) @functions)
+        (method_declaration name: (field_identifier) @functions)
+        (var_spec name: (identifier) @variables)
+        (const_spec name: (identifier) @variables)
+    """),
+    'rust': ('rust', """
+        (function_item name: (identifier) @functions)
+        (let_declaration pattern: (identifier) @variables)
+    """),
+    'php': ('php', """
+        (function_definition name: (name) @functions)
+        (method_declaration name: (name) @functions)
+        (class_declaration name: (name) @classes)
+        (assignment_expression left: (variable_name (name) @variables))
+    """),
+    'ruby': ('ruby', """
+        (method name: (_) @functions)
+        (singleton_method name: (_) @functions)
+        (class name: (constant) @classes)
+        (assignment left: [(identifier) (instance_variable)] @variables)
+    """),
+    'kotlin': ('kotlin', """
+        (function_declaration (simple_identifier) @functions)
+        (class_declaration (type_identifier) @classes)
+        (object_declaration (type_identifier) @classes)
+        (property_declaration (variable_declaration (simple_identifier) @variables))
+    """),
+}
+
+
+# Identifiers repeat heavily within and across files; keyword sets are immutable
+@functools.lru_cache(maxsize=8192)
+def _clean_identifier(name: str) -> str:
+    """Clean and validate identifier"""
+    if not name:
+        return None
+    
+    # Remove leading/trailing whitespace
+    name = name.strip()
+    
+    # Filter out control flow keywords
+    if name.lower() in _CONTROL_FLOW:
+        return None
+    
+    # Filter out built-in types
+    if name in _BUILTIN_TYPES:
+        return None
+    
+    # Filter out too short (likely not meaningful)
+    if len(name) < 2:
+        return None
+    
+    # Filter out common non-identifiers
+    if name in _NON_IDENTIFIERS:
+        return None
+    
+    # Must start with letter or underscore
+    if name[0] not in _IDENT_START:
+        return None
+    
+    return name
+
+
+@functools.lru_cache(maxsize=None)
+def _ts_backend(language: str) -> Optional[Tuple[object, object]]:
+    """Load the tree-sitter parser and compiled query for a language, once per process"""
+    if _ts is None or language not in _TS_QUERIES:
+        return None
+    grammar, query = _TS_QUERIES[language]
+    try:
+        with warnings.catch_warnings():
+            # tree-sitter 0.21 warns about the loader tree-sitter-languages uses
+            warnings.simplefilter('ignore', FutureWarning)
+            parser = _ts.get_parser(grammar)
+            return parser, _ts.get_language(grammar).query(query)
+    except Exception as e:
+        raise RuntimeError(f"tree-sitter: cannot load {grammar} grammar/query for {language}: {e}") from e
+
+
+@functools.lru_cache(maxsize=None)
+def _hs_database(language: str):
+    """Compile a language's patterns into one Hyperscan database, once per process"""
+    if _hs is None or language not in _PATTERNS:
+        return None
+    patterns = list(_PATTERNS[language].values())
+    try:
+        db = _hs.Database()
+        db.compile(
+            # Long bounded repeats are too large for SOM; unbounding them only adds candidate offsets
+            expressions=[re.sub(rb'\{0,\d+\}', b'*', p.pattern) for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            # Report the leftmost start of every match so the regex only runs near them
+            flags=[_hs.HS_FLAG_MULTILINE | _hs.HS_FLAG_SOM_LEFTMOST] * len(patterns)
+        )
+        return db
+    except Exception:
+        return None
+
+
+def _match_spans(code: bytes, language: str) -> Optional[Dict[str, List[Tuple[int, int]]]]:
+    """(start, end) of every match per kind, from one Hyperscan pass (None if unavailable)"""
+    db = _hs_database(language)
+    if db is None:
+        return None
+    
+    kinds = list(_PATTERNS[language])
+    spans = {kind: [] for kind in kinds}
+    
+    def on_match(pattern_id, start, end, flags, context):
+        spans[kinds[pattern_id]].append((start, end))
+    
+    try:
+        db.scan(code, match_event_handler=on_match)
+    except Exception:
+        return None
+    return spans
+
+
+def _findall_in_spans(pattern: Pattern[bytes], code: bytes, spans: List[Tuple[int, int]]) -> list:
+    """Same result as pattern.findall(code), but only searches from where Hyperscan saw a match"""
+    spans.sort(key=lambda span: span[1])
+    ends = [end for _, end in spans]
+    # Leftmost start among all spans ending after index i
+    min_starts = list(itertools.accumulate((start for start, _ in reversed(spans)), min))[::-1]
+    
+    matches = []
+    pos = 0
+    while True:
+        # Any match beginning at or after pos ends after pos, so it has a span
+        # ending after pos whose start is at or before the match's start
+        i = bisect.bisect_right(ends, pos)
+        if i == len(ends):
+            break
+        match = pattern.search(code, max(pos, min_starts[i]))
+        if match is None:
+            break
+        groups = match.groups(b'')
+        matches.append(groups if len(groups) > 1 else groups[0] if groups else match.group())
+        pos = match.end() if match.end() > match.start() else match.end() + 1
+    return matches
 
 
 class CodeParser:
     """Extract functions and variables from code"""
     
-    def __init__(self):
-        # Control flow keywords to exclude
-        self.control_flow = {
-            'if', 'else', 'elif', 'for', 'while', 'switch', 'case', 
-            'do', 'break', 'continue', 'return', 'goto', 'try', 
-            'catch', 'finally', 'throw', 'raises', 'except', 'with',
-            'yield', 'assert', 'pass', 'await', 'async', 'defer',
-            'select', 'range', 'foreach', 'until', 'unless'
-        }
-        
-        # Built-in types to exclude from variables
-        self.builtin_types = {
-            'int', 'float', 'double', 'char', 'bool', 'void', 'string',
-            'str', 'list', 'dict', 'tuple', 'set', 'array', 'vector',
-            'map', 'HashMap', 'ArrayList', 'LinkedList', 'String',
-            'Integer', 'Boolean', 'Object', 'Class', 'Interface',
-            'var', 'let', 'const', 'auto', 'long', 'short', 'unsigned',
-            'signed', 'static', 'final', 'public', 'private', 'protected'
-        }
+    BACKENDS = ('regex', 'tree-sitter')
+    
+    def __init__(self, backend: Optional[str] = None):
+        self.control_flow = _CONTROL_FLOW
+        self.builtin_types = _BUILTIN_TYPES
+        self.patterns = _PATTERNS
         
-        # Language-specific patterns
-        self.patterns = {
-            'python': {
-                'functions': re.compile(r'^\s*def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', re.MULTILINE),
-                'classes': re.compile(r'^\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=', re.MULTILINE),
-            },
-            'javascript': {
-                'functions': re.compile(
-                    r'(?:function\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*\(|'
-                    r'(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=\s*(?:async\s+)?(?:function|\(.*?\)\s*=>)|'
-                    r'([a-zA-Z_$][a-zA-Z0-9_$]*)\s*:\s*(?:async\s+)?function\s*\(|'
-                    r'([a-zA-Z_$][a-zA-Z0-9_$]*)\s*\([^)]*\)\s*\{)',
-                    re.MULTILINE
-                ),
-                'classes': re.compile(r'class\s+([a-zA-Z_$][a-zA-Z0-9_$]*)', re.MULTILINE),
-                'variables': re.compile(r'(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=', re.MULTILINE),
-            },
-            'java': {
-                'functions': re.compile(
-                    r'(?:public|private|protected|static|\s)+[\w<>\[\]]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+)?\s*\{',
-                    re.MULTILINE
-                ),
-                'classes': re.compile(r'(?:public|private|protected)?\s*(?:abstract|final)?\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'(?:private|public|protected|static|final|\s)+[\w<>\[\]]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;]', re.MULTILINE),
-            },
-            'cpp': {
-                'functions': re.compile(
-                    r'(?:[\w:]+\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:const)?\s*\{',
-                    re.MULTILINE
-                ),
-                'classes': re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'(?:int|float|double|char|bool|auto|const|static)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;]', re.MULTILINE),
-            },
-            'c': {
-                'functions': re.compile(
-                    r'(?:[\w\*]+\s+)+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*\{',
-                    re.MULTILINE
-                ),
-                'variables': re.compile(r'(?:int|float|double|char|void|long|short|unsigned|signed|static)\s+\*?\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;\[]', re.MULTILINE),
-            },
-            'go': {
-                'functions': re.compile(r'func\s+(?:\([^)]*\)\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', re.MULTILINE),
-                'variables': re.compile(r'(?:var|const)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s+', re.MULTILINE),
-            },
-            'rust': {
-                'functions': re.compile(r'fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\(', re.MULTILINE),
-                'variables': re.compile(r'let\s+(?:mut\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]', re.MULTILINE),
-            },
-            'php': {
-                'functions': re.compile(r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', re.MULTILINE),
-                'classes': re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'\$([a-zA-Z_][a-zA-Z0-9_]*)\s*=', re.MULTILINE),
-            },
-            'ruby': {
-                'functions': re.compile(r'def\s+([a-zA-Z_][a-zA-Z0-9_?!]*)', re.MULTILINE),
-                'classes': re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'@?([a-zA-Z_][a-zA-Z0-9_]*)\s*=', re.MULTILINE),
-            },
-            'swift': {
-                'functions': re.compile(r'func\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\(', re.MULTILINE),
-                'classes': re.compile(r'(?:class|struct|enum)\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'(?:let|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]', re.MULTILINE),
-            },
-            'kotlin': {
-                'functions': re.compile(r'fun\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(?:<[^>]*>)?\s*\(', re.MULTILINE),
-                'classes': re.compile(r'(?:class|object|interface)\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.MULTILINE),
-                'variables': re.compile(r'(?:val|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=:]', re.MULTILINE),
-            },
-        }
+        # Regex is the default; tree-sitter is opt-in (slower, different output)
+        self.backend = backend or os.environ.get('CODE_ANALYZER_BACKEND', 'regex')
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {self.backend!r}, expected one of {self.BACKENDS}")
+        if self.backend == 'tree-sitter':
+            if _ts is None:
+                raise ImportError("tree-sitter backend requires: pip install tree-sitter-languages \"tree-sitter<0.22\"")
+            # Load every grammar up front so a broken one fails here, not per file
+            for language in _TS_QUERIES:
+                _ts_backend(language)
     
     def get_language_from_extension(self, ext: str) -> str:
         """Map file extension to language"""
-        ext_map = {
-            '.py': 'python',
-            '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp', '.hpp': 'cpp', '.h': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.swift': 'swift',
-            '.kt': 'kotlin', '.kts': 'kotlin',
-            '.cs': 'csharp',
-            '.scala': 'scala',
-        }
-        return ext_map.get(ext.lower(), 'unknown')
+        return _EXT_MAP.get(ext.lower(), 'unknown')
     
     def clean_identifier(self, name: str) -> str:
         """Clean and validate identifier"""
-        if not name:
-            return None
-        
-        # Remove leading/trailing whitespace
-        name = name.strip()
-        
-        # Filter out control flow keywords
-        if name.lower() in self.control_flow:
-            return None
-        
-        # Filter out built-in types
-        if name in self.builtin_types:
-            return None
-        
-        # Filter out too short (likely not meaningful)
-        if len(name) < 2:
-            return None
-        
-        # Filter out common non-identifiers
-        if name in {'main', 'this', 'self', 'super', 'null', 'true', 'false', 'None', 'True', 'False'}:
-            return None
-        
-        # Must start with letter or underscore
-        if not re.match(r'^[a-zA-Z_]', name):
-            return None
-        
-        return name
+        return _clean_identifier(name)
     
-    def extract_from_code(self, code: str, language: str) -> Dict[str, List[str]]:
-        """Extract functions and variables from code"""
+    def extract_from_code(self, code: bytes, language: str) -> Dict[str, List[str]]:
+        """Extract functions and variables from raw (undecoded) source bytes"""
         result = {
             'functions': [],
             'classes': [],
             'variables': []
         }
         
-        if language not in self.patterns:
+        if language not in self.patterns or len(code) > _MAX_CODE_SIZE:
             return result
         
-        patterns = self.patterns[language]
+        if self.backend == 'tree-sitter':
+            backend = _ts_backend(language)
+            if backend is not None:
+                return self._extract_with_tree_sitter(code, *backend)
+        
+        # Let Hyperscan find where each kind matches, so the regex skips the rest of the file
+        spans = _match_spans(code, language)
         
-        # Extract functions
-        if 'functions' in patterns:
-            matches = patterns['functions'].findall(code)
-            # Handle tuple results from multiple capture groups
-            if matches:
-                if isinstance(matches[0], tuple):
-                    # Flatten and filter
-                    for match in matches:
-                        for name in match:
-                            if name:
-                                cleaned = self.clean_identifier(name)
-                                if cleaned and cleaned not in result['functions']:
-                                    result['functions'].append(cleaned)
-                else:
-                    for name in matches:
-                        cleaned = self.clean_identifier(name)
-                        if cleaned and cleaned not in result['functions']:
-                            result['functions'].append(cleaned)
+        for kind, pattern in self.patterns[language].items():
+            if spans is None:
+                matches = pattern.findall(code)
+            elif spans[kind]:
+                matches = _findall_in_spans(pattern, code, spans[kind])
+            else:
+                continue
+            # Patterns with several capture groups yield tuples
+            if matches and isinstance(matches[0], tuple):
+                matches = [name for match in matches for name in match]
+            # Dedupe raw matches first (dicts keep first-seen order), so each
+            # distinct name is decoded and cleaned once
+            cleaned = map(_clean_identifier, (name.decode('utf-8', 'ignore') for name in dict.fromkeys(matches)))
+            result[kind] = list(dict.fromkeys(filter(None, cleaned)))[:_KIND_LIMITS.get(kind)]
         
-        # Extract classes
-        if 'classes' in patterns:
-            matches = patterns['classes'].findall(code)
-            for name in matches:
-                cleaned = self.clean_identifier(name)
-                if cleaned and cleaned not in result['classes']:
-                    result['classes'].append(cleaned)
+        return result
+    
+    def _extract_with_tree_sitter(self, code: bytes, parser, query) -> Dict[str, List[str]]:
+        """Extract names from a tree-sitter parse (comments and strings are never matched)"""
+        found = {'functions': {}, 'classes': {}, 'variables': {}}
         
-        # Extract variables (limit to avoid noise)
-        if 'variables' in patterns:
-            matches = patterns['variables'].findall(code)
-            seen = set()
-            for name in matches:
-                cleaned = self.clean_identifier(name)
-                if cleaned and cleaned not in seen and len(result['variables']) < 50:
-                    seen.add(cleaned)
-                    result['variables'].append(cleaned)
+        tree = parser.parse(code)
+        for node, kind in query.captures(tree.root_node):
+            names = found[kind]
+            limit = _KIND_LIMITS.get(kind)
+            if limit is not None and len(names) >= limit:
+                continue
+            # Ruby instance variables keep their sigil in the node text
+            cleaned = _clean_identifier(node.text.decode('utf-8', 'ignore').lstrip('@'))
+            if cleaned:
+                names.setdefault(cleaned, None)
         
-        return result
\ No newline at end of file
+        return {kind: list(names) for kind, names in found.items()}
\ No newline at end of file
@@ -5,9 +5,10 @@ import subprocess
 import tempfile
 import shutil
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Tuple
-from collections import defaultdict
+from typing import Iterator, List, Dict, Tuple
+from collections import Counter, defaultdict
 
 
 class GitUtils:
@@ -18,6 +19,7 @@ class GitUtils:
         self.is_remote = self._is_remote_url(repo_input)
         self.temp_dir = None
         self.repo_path = None
+        self._author_ids: Dict[str, int] = {}  # Author name -> interned id
     
     def _is_remote_url(self, path: str) -> bool:
         """Check if input is a remote URL"""
@@ -35,13 +37,24 @@ class GitUtils:
         self.repo_path = Path(self.temp_dir)
         
         try:
-            subprocess.run(
-                ['git', 'clone', '--depth', '100', self.repo_input, self.temp_dir],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=300
-            )
+            try:
+                # Partial clone: full commit/tree history, blobs fetched only for checkout
+                result = self._run_clone([
+                    'git', '-c', 'protocol.version=2', 'clone',
+                    '--filter=blob:none', '--single-branch',
+                    self.repo_input, self.temp_dir
+                ])
+                # Servers without partial clone support ignore the filter and send
+                # every historical blob, exiting 0 with only a warning
+                partial = 'filtering not recognized by server' not in result.stderr
+            except subprocess.CalledProcessError:
+                partial = False
+            
+            if not partial:
+                # Fall back to a shallow clone
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                os.makedirs(self.temp_dir, exist_ok=True)
+                self._run_clone(['git', 'clone', '--depth', '100', self.repo_input, self.temp_dir])
             print(f"✓ Cloned successfully")
             return self.repo_path
             
@@ -54,6 +67,17 @@ class GitUtils:
             self.cleanup()
             raise
     
+    def _run_clone(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """Run a clone command, raising on failure or timeout"""
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=300,
+            env={**os.environ, 'LC_ALL': 'C'}  # Untranslated messages for the stderr check
+        )
+    
     def cleanup(self):
         """Remove temporary directory"""
         if self.temp_dir and os.path.exists(self.temp_dir):
@@ -102,49 +126,98 @@ class GitUtils:
         print(f"Repository owners: {owners}")
         return owners
     
-    def get_all_file_authors(self) -> Dict[str, List[str]]:
-        """Get authors for all files in repository"""
+    def get_all_file_authors(self) -> Dict[str, Counter]:
+        """Get per-file commit counts keyed by interned author id"""
         print("Analyzing file authorship...")
         
-        output = self.run_git_command([
-            'git', 'log', '--all', '--name-only', 
-            '--pretty=format:AUTHOR:%an', '--no-merges'
-        ], timeout=120)
-        
-        if not output:
+        # Stream the log instead of buffering the whole history. Paths are unquoted
+        # and NUL-terminated (-z) so they match the keys from list_tracked_files
+        try:
+            proc = subprocess.Popen(
+                # --no-renames: rename detection would fetch blobs lazily in partial clones
+                ['git', '-c', 'core.quotePath=false', 'log', '-z', '--all', '--name-only',
+                 '--no-renames', '--pretty=format:AUTHOR:%an', '--no-merges'],
+                cwd=self.repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
             return {}
         
-        file_authors = defaultdict(list)
+        # Kill git if the whole log takes longer than 120s
+        timer = threading.Timer(120, proc.kill)
+        timer.start()
+        
+        file_authors = defaultdict(Counter)
+        author_ids = self._author_ids
         current_author = None
         
-        for line in output.split('\n'):
-            if line.startswith('AUTHOR:'):
-                current_author = line[7:].strip()
-            elif line.strip() and current_author and not line.startswith('AUTHOR:'):
-                file_authors[line.strip()].append(current_author)
+        try:
+            # Each commit is 'AUTHOR:<name>\n<path>\0<path>\0...' followed by an empty record
+            for record in self._iter_nul_records(proc.stdout):
+                if record.startswith(b'AUTHOR:'):
+                    header, _, record = record.partition(b'\n')
+                    name = header[7:].decode('utf-8', 'replace').strip()
+                    current_author = author_ids.setdefault(name, len(author_ids))
+                if record and current_author is not None:
+                    file_authors[os.fsdecode(record)][current_author] += 1
+            proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+        
+        if proc.returncode != 0:
+            return {}
         
         print(f"✓ Analyzed authorship for {len(file_authors)} files")
         return dict(file_authors)
     
+    def _iter_nul_records(self, stream) -> Iterator[bytes]:
+        """Yield NUL-separated records from a binary stream, reading 1MB at a time"""
+        pending = b''
+        for chunk in iter(lambda: stream.read(1 << 20), b''):
+            records = (pending + chunk).split(b'\0')
+            pending = records.pop()
+            yield from records
+        if pending:
+            yield pending
+    
+    def get_author_ids(self, authors: List[str]) -> List[int]:
+        """Map author names to ids interned by get_all_file_authors"""
+        return [self._author_ids[author] for author in authors if author in self._author_ids]
+    
     def list_tracked_files(self) -> List[Path]:
         """Get all tracked files from git"""
         print("Getting tracked files from git...")
         
-        output = self.run_git_command(['git', 'ls-files'])
-        
-        if not output:
+        # NUL-delimited so unusual file names (quotes, newlines, non-ASCII) survive
+        tracked = self._ls_files()
+        if not tracked:
             return []
         
-        files = []
-        for line in output.split('\n'):
-            if line.strip():
-                file_path = self.repo_path / line.strip()
-                if file_path.exists():
-                    files.append(file_path)
+        # Let git find tracked files missing from the working tree in one pass
+        # instead of stat()ing every path from Python
+        deleted = set(self._ls_files('--deleted'))
+        
+        files = [self.repo_path / name for name in tracked if name not in deleted]
         
         print(f"Found {len(files)} tracked files")
         return files
     
+    def _ls_files(self, *args: str) -> List[str]:
+        """Run git ls-files -z and return the listed paths"""
+        try:
+            result = subprocess.run(
+                ['git', 'ls-files', '-z', *args],
+                cwd=self.repo_path,
+                capture_output=True,
+                check=True,
+                timeout=60
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return []
+        return [os.fsdecode(name) for name in result.stdout.split(b'\0') if name]
+    
     def is_git_repository(self) -> bool:
         """Check if path is a valid git repository"""
         if self.repo_path is None:
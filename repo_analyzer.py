@@ -1,12 +1,18 @@
 """
 repo_analyzer.py - Main repository analyzer class
 """
+import hashlib
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Counter, Dict, FrozenSet, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
 
+try:
+    import orjson  # Optional: faster JSON output (pip install orjson)
+except ImportError:
+    orjson = None
+
 from git_utils import GitUtils
 from file_filters import FileFilters
 from code_parser import CodeParser
@@ -21,41 +27,51 @@ class RepoAnalyzer:
         self.file_filters = None
         self.code_parser = CodeParser()
         self.repo_owners = []
+        self.owner_ids = frozenset()
+        self._extract_cache: Dict[Tuple[bytes, str], Dict] = {}  # (content digest, language) -> elements
     
-    def count_lines(self, file_path: Path) -> int:
-        """Count lines in a file"""
-        try:
-            with open(file_path, 'rb') as f:
-                return sum(1 for _ in f)
-        except:
+    def count_lines(self, code: bytes) -> int:
+        """Count lines in file contents"""
+        if not code:
             return 0
+        lines = code.count(b'\n')
+        if not code.endswith(b'\n'):
+            lines += 1  # Last line without trailing newline
+        return lines
     
-    def calculate_owner_contribution(self, authors: List[str]) -> float:
+    def calculate_owner_contribution(self, authors: Counter) -> float:
         """Calculate owner contribution ratio"""
-        if not authors or not self.repo_owners:
+        if not authors or not self.owner_ids:
             return 0.0
-        owner_commits = sum(1 for author in authors if author in self.repo_owners)
-        return owner_commits / len(authors)
+        owner_commits = sum(authors[owner_id] for owner_id in self.owner_ids)
+        return owner_commits / sum(authors.values())
     
-    def is_owner_modified(self, authors: List[str]) -> bool:
+    def is_owner_modified(self, authors: Counter) -> bool:
         """Check if owner touched file"""
-        return any(author in self.repo_owners for author in authors)
+        return any(owner_id in authors for owner_id in self.owner_ids)
     
-    def extract_code_elements(self, file_path: Path) -> Dict:
-        """Extract functions and variables from file"""
+    def extract_code_elements(self, code: bytes, ext: str) -> Dict:
+        """Extract functions and variables from file contents"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                code = f.read()
+            # Patterns are bytes; identifiers are decoded only once matched
+            language = self.code_parser.get_language_from_extension(ext)
+            
+            # Byte-identical files (license copies, vendored duplicates) are extracted once
+            key = (hashlib.blake2b(code, digest_size=16).digest(), language)
+            cached = self._extract_cache.get(key)
+            if cached is not None:
+                return cached
             
-            language = self.code_parser.get_language_from_extension(file_path.suffix)
             extracted = self.code_parser.extract_from_code(code, language)
             
-            return {
+            elements = {
                 'language': language,
                 'functions': extracted['functions'][:30],  # Limit to top 30
                 'classes': extracted['classes'][:20],      # Limit to top 20
                 'variables': extracted['variables'][:30]   # Limit to top 30
             }
+            self._extract_cache[key] = elements
+            return elements
         except:
             return {
                 'language': 'unknown',
@@ -68,7 +84,23 @@ class RepoAnalyzer:
         """Process single file and extract information"""
         rel_path_str = str(file_path.relative_to(self.git_utils.repo_path))
         
-        # Hard excludes (fastest checks first)
+        # Extension filter (cheapest checks first)
+        is_code = self.file_filters.is_code_file(file_path)
+        is_config = self.file_filters.is_config_file(file_path)
+        
+        if not (is_code or is_config):
+            return None, 'wrong_extension'
+        
+        # Size check from a single stat
+        try:
+            st = file_path.stat()
+        except:
+            return None, 'error'
+        
+        if st.st_size > 500000:  # 500KB
+            return None, 'generated'
+        
+        # Hard excludes
         if self.file_filters.is_excluded_file(file_path):
             return None, 'hard_filter'
         
@@ -84,7 +116,7 @@ class RepoAnalyzer:
             return None, 'generated'
         
         # Authorship check
-        authors = all_file_authors.get(rel_path_str, [])
+        authors = all_file_authors.get(rel_path_str)
         
         if not authors or not self.is_owner_modified(authors):
             return None, 'not_owner'
@@ -92,29 +124,20 @@ class RepoAnalyzer:
         owner_ratio = self.calculate_owner_contribution(authors)
         
         # Owner contribution threshold
-        if not (owner_ratio > 0.3 or (len(authors) >= 3 and owner_ratio > 0)):
+        if not (owner_ratio > 0.3 or (sum(authors.values()) >= 3 and owner_ratio > 0)):
             return None, 'not_owner'
         
-        # Extension filter
-        is_code = self.file_filters.is_code_file(file_path)
-        is_config = self.file_filters.is_config_file(file_path)
-        
-        if not is_code:
-            if is_config and owner_ratio < 0.5:
-                return None, 'wrong_extension'
-            elif not is_config:
-                return None, 'wrong_extension'
+        # Config files need a stronger owner share
+        if not is_code and owner_ratio < 0.5:
+            return None, 'wrong_extension'
         
-        # Size and line count
         try:
-            size = file_path.stat().st_size
-            if size > 500000:  # 500KB
-                return None, 'generated'
-            
-            lines = self.count_lines(file_path)
+            # Single read shared by line count and extraction
+            code = file_path.read_bytes()
+            lines = self.count_lines(code)
             
             # Extract code elements (functions, variables, classes)
-            code_elements = self.extract_code_elements(file_path)
+            code_elements = self.extract_code_elements(code, file_path.suffix)
             
         except:
             return None, 'error'
@@ -151,6 +174,7 @@ class RepoAnalyzer:
         
         # Get file authorship data
         all_file_authors = self.git_utils.get_all_file_authors()
+        self.owner_ids = frozenset(self.git_utils.get_author_ids(self.repo_owners))
         
         # Get all tracked files
         all_files = self.git_utils.list_tracked_files()
@@ -175,12 +199,17 @@ class RepoAnalyzer:
         
         print("\nProcessing files and extracting code elements...")
         
-        # Parallel processing
-        max_workers = min(32, (os.cpu_count() or 4) * 4)
+        # Parallel processing: regex scans are CPU-bound, so use processes
+        # (one per core) rather than threads contending for the GIL
+        max_workers = os.cpu_count() or 4
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(repo_path, self.repo_owners, self.owner_ids, self.file_filters, all_file_authors)
+        ) as executor:
             futures = {
-                executor.submit(self.process_file, file_path, all_file_authors): file_path
+                executor.submit(_process_file, file_path): file_path
                 for file_path in filtered_files
             }
             
@@ -230,8 +259,12 @@ class RepoAnalyzer:
             result = self.analyze_repo()
             
             output_path = Path(output_file)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
             
             print(f"\n{'='*60}")
             print(f"Results saved: {output_path.absolute()}")
@@ -276,4 +309,28 @@ class RepoAnalyzer:
     def cleanup(self):
         """Clean up resources"""
         if self.git_utils:
-            self.git_utils.cleanup()
\ No newline at end of file
+            self.git_utils.cleanup()
+
+
+# Per-process analyzer state, set once by _init_worker so the authorship
+# map is shipped to each worker once instead of with every task
+_worker_analyzer = None
+_worker_file_authors = None
+
+
+def _init_worker(repo_path: Path, repo_owners: List[str], owner_ids: FrozenSet[int],
+                 file_filters: FileFilters, all_file_authors: Dict):
+    """Initialize a worker process with read-only analysis state"""
+    global _worker_analyzer, _worker_file_authors
+    analyzer = RepoAnalyzer(str(repo_path))
+    analyzer.git_utils.repo_path = repo_path
+    analyzer.file_filters = file_filters
+    analyzer.repo_owners = repo_owners
+    analyzer.owner_ids = owner_ids
+    _worker_analyzer = analyzer
+    _worker_file_authors = all_file_authors
+
+
+def _process_file(file_path: Path) -> Tuple[Dict, str]:
+    """Process single file in a worker process"""
+    return _worker_analyzer.process_file(file_path, _worker_file_authors)
\ No newline at end of file
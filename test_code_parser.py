@@ -0,0 +1,45 @@
+"""
+test_code_parser.py - Regression checks for the extraction patterns
+"""
+import time
+import unittest
+
+from code_parser import CodeParser
+
+
+class BacktrackingTest(unittest.TestCase):
+    """Unclosed parameter lists must not make function patterns quadratic"""
+
+    # Each input is under the 500KB cap and took 30s+ with unbounded \([^)]*\)
+    INPUTS = {
+        'java': (b' int f(' * 3000 + b'\n') * 20,
+        'c': (b' int ab(' * 3000 + b'\n') * 20,
+        'cpp': (b'ab(' * 1000 + b'\n' * 10) * 100,
+        'javascript': (b'ab(' * 1000 + b'\n' * 10) * 100,
+        'go': (b'func (' * 1000 + b'\n' * 10) * 60,
+    }
+
+    def test_unclosed_parens_are_fast(self):
+        parser = CodeParser()
+        for language, code in self.INPUTS.items():
+            with self.subTest(language=language):
+                start = time.perf_counter()
+                parser.extract_from_code(code, language)
+                self.assertLess(time.perf_counter() - start, 5)
+
+    def test_parameter_lists_still_match(self):
+        parser = CodeParser()
+        code = b'int add(int a, int b) {\n    return a + b;\n}\n'
+        self.assertEqual(parser.extract_from_code(code, 'c')['functions'], ['add'])
+
+
+class WhitespaceTest(unittest.TestCase):
+    """Vertical tab counts as whitespace on every regex engine, as in stdlib re"""
+
+    def test_vertical_tab_is_whitespace(self):
+        result = CodeParser().extract_from_code(b'def\x0bfoo(x):\n', 'python')
+        self.assertEqual(result['functions'], ['foo'])
+
+
+if __name__ == '__main__':
+    unittest.main()
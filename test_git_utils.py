@@ -0,0 +1,57 @@
+"""
+test_git_utils.py - Regression checks for git path handling
+"""
+import contextlib
+import io
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from git_utils import GitUtils
+from repo_analyzer import RepoAnalyzer
+
+
+class UnusualFileNamesTest(unittest.TestCase):
+    """Paths git would C-quote must match between ls-files and log"""
+
+    FILE_NAMES = ['plain.py', 'café.py', 'we"ird.py']
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo_path = Path(self.temp_dir.name)
+        self._git('init', '-q')
+        for i, name in enumerate(self.FILE_NAMES):
+            (self.repo_path / name).write_text(f'value_{i} = {i}\n', encoding='utf-8')
+        self._git('add', '-A')
+        self._git('-c', 'user.name=Alice', '-c', 'user.email=alice@example.com',
+                  'commit', '-q', '-m', 'initial')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _git(self, *args):
+        subprocess.run(['git', *args], cwd=self.repo_path, check=True, capture_output=True)
+
+    def test_authors_keyed_like_tracked_files(self):
+        git_utils = GitUtils(str(self.repo_path))
+        git_utils.clone_repository()
+        with contextlib.redirect_stdout(io.StringIO()):
+            authors = git_utils.get_all_file_authors()
+            tracked = git_utils.list_tracked_files()
+
+        rel_paths = sorted(str(p.relative_to(git_utils.repo_path)) for p in tracked)
+        self.assertEqual(rel_paths, sorted(self.FILE_NAMES))
+        self.assertEqual(sorted(authors), sorted(self.FILE_NAMES))
+
+    def test_non_ascii_files_are_owner_files(self):
+        analyzer = RepoAnalyzer(str(self.repo_path))
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = analyzer.analyze_repo()
+
+        self.assertEqual(result['stats']['excluded_not_owner_modified'], 0)
+        self.assertEqual(sorted(f['path'] for f in result['files']), sorted(self.FILE_NAMES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,25 +1,34 @@
 import json
-import numpy as np
+from itertools import chain
 
-with open("files.json", "r") as f:
-    data = json.load(f)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    with open("files.json", "rb") as f:
+        data = orjson.loads(f.read())
+else:
+    with open("files.json", "r") as f:
+        data = json.load(f)
 
 # total line of code
 lines_count = [file["lines"] for file in data["files"]] 
-total_lines = np.sum(lines_count)
+total_lines = sum(lines_count)
 print("Total Line of Code =", total_lines)
 
 # function names
-functions = [func for file in data["files"] for func in file["functions"]]
+functions = list(chain.from_iterable(file["functions"] for file in data["files"]))
 print("\nAll functions:", functions)
 print("Total functions:", len(functions))
 
 # class names
-classes = [className for file in data["files"] for className in file["classes"]]
+classes = list(chain.from_iterable(file["classes"] for file in data["files"]))
 print("\nAll classes:", classes)
 print("Total classes:", len(classes))
 
 # variable names
-variables = [var for file in data["files"] for var in file["variables"]]
+variables = list(chain.from_iterable(file["variables"] for file in data["files"]))
 print("First 20 variable names =", variables[:20])
 print("Total number of variables =", len(variables))
\ No newline at end of file